@@ -6,4 +6,9 @@ load_dotenv()
 DATABASE_PATH = os.getenv("DATABASE_PATH", "data/movies.db")
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2")
-OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
\ No newline at end of file
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+CACHE_MAX_AGE = int(os.getenv("CACHE_MAX_AGE", "300"))
+MAX_BATCH_IDS_GET = int(os.getenv("MAX_BATCH_IDS_GET", "100"))
+MAX_BATCH_IDS_POST = int(os.getenv("MAX_BATCH_IDS_POST", "500"))
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", "1800"))
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "1000"))
\ No newline at end of file
@@ -1,18 +1,53 @@
+import os
 import sqlite3
 import json
 from typing import List, Dict, Optional
 from app.config import DATABASE_PATH
+from app.title_index import TitleIndex
+
+# Default SQLITE_MAX_VARIABLE_NUMBER on builds older than 3.32
+SQLITE_MAX_VARIABLES = 999
+
+
+def _parse_json_fields(movie: Dict) -> Dict:
+    for field in ['genres', 'movie_cast']:
+        if movie.get(field):
+            try:
+                movie[field] = json.loads(movie[field])
+            except:
+                movie[field] = []
+    return movie
 
 
 class MovieDB:
     def __init__(self, db_path: str = DATABASE_PATH):
         self.db_path = db_path
+        self._title_index: Optional[TitleIndex] = None
+        self._title_index_version: Optional[str] = None
     
     def _get_connection(self):
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
     
+    def build_title_index(self) -> TitleIndex:
+        """Load all titles into the in-memory trigram index"""
+        # Read the version first so writes during the load trigger a rebuild
+        version = self.get_version()
+        conn = self._get_connection()
+        cursor = conn.execute('SELECT id, title FROM movies')
+        self._title_index = TitleIndex((row['id'], row['title']) for row in cursor)
+        conn.close()
+        self._title_index_version = version
+        return self._title_index
+    
+    @property
+    def title_index(self) -> TitleIndex:
+        """Trigram index, rebuilt whenever the database has changed"""
+        if self._title_index is None or self._title_index_version != self.get_version():
+            self.build_title_index()
+        return self._title_index
+    
     def search(
         self,
         title: Optional[str] = None,
@@ -23,7 +58,46 @@ class MovieDB:
     ) -> List[Dict]:
         """
         Search movies with optional filters
+        
+        Falls back to fuzzy title matching when the exact LIKE finds nothing
         """
+        results = self._search(title, genre, year, min_rating, limit)
+        
+        if title and not results:
+            results = self._search_fuzzy_title(title, genre, year, min_rating, limit)
+        
+        return results
+    
+    def _search_fuzzy_title(
+        self,
+        title: str,
+        genre: Optional[str],
+        year: Optional[int],
+        min_rating: float,
+        limit: int
+    ) -> List[Dict]:
+        """Resolve a misspelled title via the trigram index"""
+        # Over-fetch candidates since the other filters may drop some
+        candidates = self.title_index.lookup(title, limit=max(limit * 4, 20))
+        if not candidates:
+            return []
+        
+        rank = {movie_id: i for i, (movie_id, _) in enumerate(candidates)}
+        results = self._search(
+            None, genre, year, min_rating, len(candidates), ids=list(rank)
+        )
+        results.sort(key=lambda movie: rank[movie['id']])
+        return results[:limit]
+    
+    def _search(
+        self,
+        title: Optional[str],
+        genre: Optional[str],
+        year: Optional[int],
+        min_rating: float,
+        limit: int,
+        ids: Optional[List[int]] = None
+    ) -> List[Dict]:
         conn = self._get_connection()
         
         query = """
@@ -34,6 +108,10 @@ class MovieDB:
         """
         params = [min_rating]
         
+        if ids is not None:
+            query += f" AND id IN ({', '.join('?' * len(ids))})"
+            params.extend(ids)
+        
         if title:
             query += " AND title LIKE ?"
             params.append(f"%{title}%")
@@ -59,12 +137,7 @@ class MovieDB:
         
         # Parse JSON fields
         for movie in results:
-            for field in ['genres', 'movie_cast']:
-                if movie.get(field):
-                    try:
-                        movie[field] = json.loads(movie[field])
-                    except:
-                        movie[field] = []
+            _parse_json_fields(movie)
         
         return results
     
@@ -80,15 +153,34 @@ class MovieDB:
         if not row:
             return None
         
-        movie = dict(row)
-        for field in ['genres', 'movie_cast']:
-            if movie.get(field):
-                try:
-                    movie[field] = json.loads(movie[field])
-                except:
-                    movie[field] = []
+        return _parse_json_fields(dict(row))
+    
+    def get_many(self, movie_ids: List[int]) -> List[Dict]:
+        """Fetch several movies in one connection, in the order requested"""
+        ids = list(dict.fromkeys(movie_ids))
+        if not ids:
+            return []
+        
+        conn = self._get_connection()
+        by_id = {}
+        # Chunk so each IN (...) stays under SQLite's bound-variable limit
+        for start in range(0, len(ids), SQLITE_MAX_VARIABLES):
+            chunk = ids[start:start + SQLITE_MAX_VARIABLES]
+            cursor = conn.execute(
+                'SELECT id, title, year, genres, overview, vote_average, vote_count, movie_cast, director '
+                f'FROM movies WHERE id IN ({", ".join("?" * len(chunk))})',
+                chunk
+            )
+            for row in cursor.fetchall():
+                by_id[row['id']] = _parse_json_fields(dict(row))
+        conn.close()
         
-        return movie
+        return [by_id[movie_id] for movie_id in ids if movie_id in by_id]
+    
+    def get_version(self) -> str:
+        """Opaque token that changes whenever the database file changes"""
+        stat = os.stat(self.db_path)
+        return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
         
     def get_top_rated(self, limit: int = 10, min_votes: int = 100) -> List[Dict]:
         """Get top rated movies with minimum vote threshold"""
@@ -105,11 +197,6 @@ class MovieDB:
         conn.close()
         
         for movie in results:
-            for field in ['genres', 'movie_cast']:
-                if movie.get(field):
-                    try:
-                        movie[field] = json.loads(movie[field])
-                    except:
-                        movie[field] = []
+            _parse_json_fields(movie)
         
         return results
\ No newline at end of file
@@ -1,10 +1,14 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, Response
 from pydantic import BaseModel
 from typing import Optional, List, Dict
+import hashlib
 import logging
 
+from app.config import CACHE_MAX_AGE, MAX_BATCH_IDS_GET, MAX_BATCH_IDS_POST
 from app.database import MovieDB
-from app.query_processor import parse_query
+from app.query_processor import parse_query, merge_follow_up, resolve_reference
+from app.session_store import SessionStore
 from app.llm_service import generate_response
 
 
@@ -14,23 +18,96 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+db = MovieDB()
+sessions = SessionStore()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the title index up front so the first typo doesn't pay for it
+    try:
+        index = db.build_title_index()
+        logger.info(f"Title index built with {len(index)} movies")
+    except Exception as e:
+        logger.warning(f"Title index not built at startup: {e}")
+    yield
+
+
 app = FastAPI(
     title="Movie RAG API",
     description="Natural language movie queries combining structured data with LLM",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-db = MovieDB()
-
 
 class QueryRequest(BaseModel):
     question: str
+    session_id: Optional[str] = None
 
 
 class QueryResponse(BaseModel):
     answer: str
     movies: List[Dict]
     query_info: Dict
+    session_id: Optional[str] = None
+
+
+class MoviesRequest(BaseModel):
+    ids: List[int]
+
+
+# SQLite INTEGER range; larger ids raise OverflowError when bound
+SQLITE_INT_MIN = -2**63
+SQLITE_INT_MAX = 2**63 - 1
+
+
+def _cache_headers(key: str) -> Dict[str, str]:
+    """ETag derived from the DB version so clients can revalidate with 304s"""
+    digest = hashlib.sha1(f"{db.get_version()}:{key}".encode()).hexdigest()
+    return {
+        "ETag": f'"{digest}"',
+        "Cache-Control": f"public, max-age={CACHE_MAX_AGE}"
+    }
+
+
+def _if_none_match(request: Request) -> List[str]:
+    """If-None-Match tags with W/ stripped for weak comparison (RFC 9110)"""
+    if_none_match = request.headers.get("if-none-match", "")
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+
+def _not_modified(request: Request, headers: Dict[str, str]) -> bool:
+    tags = _if_none_match(request)
+    return headers["ETag"] in tags or "*" in tags
+
+
+def _check_ids(ids: List[int]):
+    if any(not SQLITE_INT_MIN <= movie_id <= SQLITE_INT_MAX for movie_id in ids):
+        raise HTTPException(status_code=400, detail="Movie ids must be 64-bit integers")
+
+
+def _batch_ids(ids: List[int], max_ids: int) -> List[int]:
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        raise HTTPException(status_code=400, detail="At least one movie id is required")
+    if len(ids) > max_ids:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {max_ids} movie ids per request"
+        )
+    _check_ids(ids)
+    return ids
+
+
+def _batch_result(ids: List[int]) -> Dict:
+    movies = db.get_many(ids)
+    found = {m['id'] for m in movies}
+    return {
+        "movies": movies,
+        "missing": [movie_id for movie_id in ids if movie_id not in found]
+    }
 
 
 @app.get("/")
@@ -40,6 +117,7 @@ async def root():
         "endpoints": {
             "query": "POST /query",
             "movie": "GET /movies/{id}",
+            "movies": "GET /movies?ids=1,2,3 | POST /movies",
             "health": "GET /health"
         }
     }
@@ -72,20 +150,41 @@ async def query_movies(request: QueryRequest):
         
         logger.info(f"Query: {question}")
         
+        query_info = None
+        movies = None
+        session = sessions.get(request.session_id) if request.session_id else None
+        
+        if session:
+            # Follow-up turn: point at a previous result or refine its filters
+            ref = resolve_reference(question)
+            if ref is not None and -len(session['movies']) <= ref < len(session['movies']):
+                movie = session['movies'][ref]
+                query_info = {**session['query_info'], 'intent': 'describe', 'keywords': movie['title']}
+                movies = [movie]
+            else:
+                query_info = merge_follow_up(question, session['query_info'])
+                if query_info == session['query_info']:
+                    movies = session['movies']
+        
         # Parse query
-        query_info = parse_query(question)
+        if query_info is None:
+            query_info = parse_query(question)
         logger.info(f"Parsed: {query_info}")
         
         # Search database based on intent
-        if query_info['intent'] == 'top_rated':
-            movies = db.get_top_rated(limit=5)
-        else:
-            movies = db.search(
-                title=query_info.get('keywords'),
-                genre=query_info.get('genre'),
-                year=query_info.get('year'),
-                limit=5
-            )
+        if movies is None:
+            if query_info['intent'] == 'top_rated':
+                movies = db.get_top_rated(limit=5)
+            else:
+                movies = db.search(
+                    title=query_info.get('keywords'),
+                    genre=query_info.get('genre'),
+                    year=query_info.get('year'),
+                    limit=5
+                )
+            
+            if request.session_id:
+                sessions.set(request.session_id, {'query_info': query_info, 'movies': movies})
         
         logger.info(f"Found {len(movies)} movies")
         
@@ -99,7 +198,8 @@ async def query_movies(request: QueryRequest):
         return QueryResponse(
             answer=answer,
             movies=movies,
-            query_info=query_info
+            query_info=query_info,
+            session_id=request.session_id
         )
     
     except HTTPException:
@@ -109,12 +209,50 @@ async def query_movies(request: QueryRequest):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@app.get("/movies")
+async def get_movies(ids: str, request: Request, response: Response):
+    """
+    Get several movies in one round-trip
+    
+    Example: GET /movies?ids=1,2,3
+    """
+    try:
+        movie_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    movie_ids = _batch_ids(movie_ids, MAX_BATCH_IDS_GET)
+    
+    headers = _cache_headers(",".join(map(str, movie_ids)))
+    if _not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    return _batch_result(movie_ids)
+
+
+@app.post("/movies")
+async def post_movies(body: MoviesRequest):
+    """Batch variant of GET /movies for ID lists too long for a query string"""
+    return _batch_result(_batch_ids(body.ids, MAX_BATCH_IDS_POST))
+
+
 @app.get("/movies/{movie_id}")
-async def get_movie(movie_id: int):
+async def get_movie(movie_id: int, request: Request, response: Response):
     """Get detailed information about a specific movie"""
+    _check_ids([movie_id])
+    
+    # Concrete ETag match skips the DB; * only matches an existing movie
+    headers = _cache_headers(str(movie_id))
+    tags = _if_none_match(request)
+    if headers["ETag"] in tags:
+        return Response(status_code=304, headers=headers)
+    
     movie = db.get_by_id(movie_id)
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found")
+    if "*" in tags:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
     return movie
 
 
@@ -9,6 +9,12 @@ GENRES = [
     'sci-fi', 'thriller', 'war', 'western'
 ]
 
+# Plural forms that don't contain their genre as a substring
+GENRE_PLURALS = {
+    'comedies': 'comedy', 'documentaries': 'documentary',
+    'mysteries': 'mystery', 'fantasies': 'fantasy'
+}
+
 # Words to remove when extracting title keywords
 STOP_WORDS = [
     'recommend', 'about', 'find', 'show', 'me', 'tell', 'what', 'is',
@@ -36,12 +42,19 @@ def parse_query(query: str) -> Dict:
     
     # Extract genre
     genre = None
-    for g in GENRES:
-        if g in q:
+    for plural, g in GENRE_PLURALS.items():
+        if plural in q:
             genre = g
-            if g == 'sci-fi':
-                genre = 'science fiction'  # Match DB format
+            q_genre = plural
             break
+    else:
+        for g in GENRES:
+            if g in q:
+                genre = g
+                q_genre = g
+                if g == 'sci-fi':
+                    genre = 'science fiction'  # Match DB format
+                break
     
     # Extract year
     year = None
@@ -58,6 +71,7 @@ def parse_query(query: str) -> Dict:
     
     # Remove genre from keywords
     if genre:
+        title_keywords = title_keywords.replace(q_genre, '')
         title_keywords = title_keywords.replace(genre, '')
         title_keywords = title_keywords.replace('sci-fi', '')  # Also remove sci-fi variant
     
@@ -79,4 +93,96 @@ def parse_query(query: str) -> Dict:
         'genre': genre,
         'year': year,
         'keywords': title_keywords
-    }
\ No newline at end of file
+    }
+
+
+# Phrases that mark a question as refining the previous one
+FOLLOW_UP_PATTERN = re.compile(r'^\s*(?:what about|how about|and|only|just)\b', re.IGNORECASE)
+
+# Words in follow-ups that never name a title on their own
+FILLER_WORDS = [
+    'more', 'else', 'one', 'ones', 'something', 'anything', 'some', 'any',
+    'it', 'that', 'this', 'those', 'only', 'just', 'are', 'was', 'were',
+    'good', 'great', 'with', 'for', 'to'
+]
+
+# Year ranges aren't supported by search, so these can't refine a filter
+YEAR_RANGE_PATTERN = re.compile(r'\b(?:after|before|since|until|between|earlier|later)\b', re.IGNORECASE)
+
+# Ordinal references to movies from the previous answer. The ordinal must be
+# followed by one/movie/film or end the question, so titles like
+# "The Last Samurai" aren't read as references.
+ORDINALS = {'first': 0, 'second': 1, 'third': 2, 'fourth': 3, 'fifth': 4, 'last': -1}
+REFERENCE_PATTERN = re.compile(
+    r'\bthe (' + '|'.join(ORDINALS) + r')(?:\s+(?:one|movie|film)\b|\W*$)', re.IGNORECASE
+)
+
+
+def _capitalized(text: str) -> set:
+    """Lowercased words written with a capital, e.g. 'It' in 'What about It?'"""
+    return {w.lower() for w in re.findall(r'\b[A-Z]\w*', text)}
+
+
+def _title_keywords(keywords: Optional[str], titled: set = frozenset()) -> Optional[str]:
+    """
+    Strip punctuation; None if only filler words remain
+    
+    Filler words the user capitalized (``titled``) count as title words.
+    """
+    if not keywords:
+        return None
+    words = re.sub(r'[^\w\s]', ' ', keywords).split()
+    if all(w in FILLER_WORDS and w not in titled for w in words):
+        return None
+    return ' '.join(words)
+
+
+def resolve_reference(query: str) -> Optional[int]:
+    """
+    Index of the previous result a question points at ("the second one")
+    
+    Returns None when the question also names a title, genre or year of
+    its own.
+    """
+    match = REFERENCE_PATTERN.search(query)
+    if not match:
+        return None
+    rest = query[:match.start()] + ' ' + query[match.end():]
+    current = parse_query(rest)
+    if current['genre'] or current['year'] or _title_keywords(current['keywords']):
+        return None
+    return ORDINALS[match.group(1).lower()]
+
+
+def merge_follow_up(query: str, previous: Dict) -> Optional[Dict]:
+    """
+    Merge a follow-up question into the previous query's filters
+    
+    A new genre or year refines the previous filters; a bare title starts
+    over with that title. Returns None when the question doesn't read as a
+    follow-up, asks for a year range, or follows a top-rated query (whose
+    results ignore filters).
+    """
+    match = FOLLOW_UP_PATTERN.match(query)
+    if not match or previous['intent'] == 'top_rated':
+        return None
+    
+    rest = query[match.end():]
+    current = parse_query(rest)
+    if current['year'] is not None and YEAR_RANGE_PATTERN.search(rest):
+        return None
+    
+    merged = dict(previous)
+    merged['keywords'] = _title_keywords(previous.get('keywords'))
+    if current['genre'] is not None or current['year'] is not None:
+        for key in ('genre', 'year'):
+            if current[key] is not None:
+                merged[key] = current[key]
+    else:
+        keywords = _title_keywords(current['keywords'], _capitalized(rest))
+        if keywords:
+            merged.update(genre=None, year=None, keywords=keywords)
+    if current['intent'] != 'search':
+        merged['intent'] = current['intent']
+    
+    return merged
@@ -0,0 +1,57 @@
+"""
+Bounded in-memory conversation state (LRU + TTL)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from app.config import SESSION_MAX_ENTRIES, SESSION_TTL_SECONDS
+
+
+class SessionStore:
+    def __init__(
+        self,
+        max_entries: int = SESSION_MAX_ENTRIES,
+        ttl_seconds: float = SESSION_TTL_SECONDS
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        """Return the session state, or None if unknown or expired"""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            expires_at, state = entry
+            now = time.monotonic()
+            if expires_at <= now:
+                del self._sessions[session_id]
+                return None
+            # Sliding expiry keeps access order and expiry order the same
+            self._sessions[session_id] = (now + self.ttl_seconds, state)
+            self._sessions.move_to_end(session_id)
+            return state
+
+    def set(self, session_id: str, state: Dict):
+        """Store state, evicting expired then least recently used sessions"""
+        with self._lock:
+            now = time.monotonic()
+            self._sessions[session_id] = (now + self.ttl_seconds, state)
+            self._sessions.move_to_end(session_id)
+
+            # Expired entries cluster at the front
+            while self._sessions:
+                oldest_id, (expires_at, _) = next(iter(self._sessions.items()))
+                if expires_at > now or oldest_id == session_id:
+                    break
+                del self._sessions[oldest_id]
+
+            while len(self._sessions) > self.max_entries:
+                self._sessions.popitem(last=False)
@@ -0,0 +1,74 @@
+"""
+In-memory trigram index over movie titles for typo-tolerant lookups
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Minimum trigram similarity for a title to count as a candidate
+MIN_SIMILARITY = 0.3
+
+
+def _normalize(text: str) -> str:
+    """Lowercase and collapse punctuation/whitespace to single spaces"""
+    return re.sub(r'[^a-z0-9]+', ' ', text.lower()).strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    """Padded character trigrams of each word (pg_trgm style)"""
+    grams = set()
+    for word in _normalize(text).split():
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+class TitleIndex:
+    def __init__(self, titles: Iterable[Tuple[int, str]] = ()):
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._sizes: Dict[int, int] = {}
+        for movie_id, title in titles:
+            self.add(movie_id, title)
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def add(self, movie_id: int, title: str):
+        grams = trigrams(title or '')
+        if not grams:
+            return
+        self._sizes[movie_id] = len(grams)
+        for gram in grams:
+            self._postings[gram].append(movie_id)
+
+    def lookup(
+        self,
+        keywords: str,
+        limit: int = 5,
+        min_similarity: float = MIN_SIMILARITY
+    ) -> List[Tuple[int, float]]:
+        """
+        Return (movie_id, similarity) pairs ranked best first
+
+        Similarity is shared trigrams over the union of both trigram sets.
+        """
+        query_grams = trigrams(keywords or '')
+        if not query_grams:
+            return []
+
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for movie_id in self._postings.get(gram, ()):
+                shared[movie_id] += 1
+
+        n = len(query_grams)
+        scored = []
+        for movie_id, count in shared.items():
+            score = count / (n + self._sizes[movie_id] - count)
+            if score >= min_similarity:
+                scored.append((movie_id, score))
+
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
@@ -1,5 +1,7 @@
 from fastapi.testclient import TestClient
-from app.main import app
+from app.config import MAX_BATCH_IDS_GET, MAX_BATCH_IDS_POST
+from app import database
+from app.main import app, db
 import pytest
 
 client = TestClient(app)
@@ -108,4 +110,192 @@ def test_agent_info():
     response = client.get("/agent/info")
     assert response.status_code == 200
     data = response.json()
-    assert "tables" in data or "error" in data
\ No newline at end of file
+    assert "tables" in data or "error" in data
+
+
+def test_query_with_misspelled_title():
+    """Misspelled titles fall back to the trigram index"""
+    response = client.post(
+        "/query",
+        json={"question": "Tell me about Incepton"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["query_info"]["keywords"] == "incepton"
+    assert any(m["title"] == "Inception" for m in data["movies"])
+
+
+def test_movies_batch():
+    response = client.get("/movies?ids=1,999999")
+    assert response.status_code == 200
+    data = response.json()
+    assert 999999 in data["missing"]
+    assert all(m["id"] != 999999 for m in data["movies"])
+    assert "ETag" in response.headers
+    assert "Cache-Control" in response.headers
+
+
+def test_movies_batch_revalidate():
+    first = client.get("/movies?ids=1,2,3")
+    etag = first.headers["ETag"]
+    second = client.get("/movies?ids=1,2,3", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+
+
+def test_movies_batch_revalidate_weak_tag():
+    first = client.get("/movies?ids=1,2,3")
+    weak = "W/" + first.headers["ETag"]
+    second = client.get(
+        "/movies?ids=1,2,3",
+        headers={"If-None-Match": f'"stale", {weak}'}
+    )
+    assert second.status_code == 304
+
+
+def test_movies_batch_revalidate_wildcard():
+    response = client.get("/movies?ids=1,2,3", headers={"If-None-Match": "*"})
+    assert response.status_code == 304
+
+
+def test_movie_not_found_ignores_wildcard():
+    response = client.get("/movies/999999", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
+
+
+def test_movies_batch_limits():
+    ids = list(range(1, MAX_BATCH_IDS_GET + 2))
+    response = client.get("/movies?ids=" + ",".join(map(str, ids)))
+    assert response.status_code == 400
+    
+    # POST accepts longer lists than the query string variant
+    response = client.post("/movies", json={"ids": ids})
+    assert response.status_code == 200
+    
+    response = client.post("/movies", json={"ids": list(range(1, MAX_BATCH_IDS_POST + 2))})
+    assert response.status_code == 400
+
+
+def test_movies_batch_rejects_out_of_range_ids():
+    too_big = 2**64
+    assert client.get(f"/movies?ids=1,{too_big}").status_code == 400
+    assert client.post("/movies", json={"ids": [1, too_big]}).status_code == 400
+    assert client.get(f"/movies/{too_big}").status_code == 400
+
+
+def test_movies_batch_chunks_large_id_lists(monkeypatch):
+    expected = [m["id"] for m in client.get("/movies?ids=3,999999,2,1").json()["movies"]]
+    monkeypatch.setattr(database, "SQLITE_MAX_VARIABLES", 2)
+    response = client.post("/movies", json={"ids": [3, 999999, 2, 1]})
+    assert response.status_code == 200
+    assert [m["id"] for m in response.json()["movies"]] == expected
+
+
+def test_movie_revalidate_skips_db(monkeypatch):
+    first = client.get("/movies/1")
+    if first.status_code != 200:
+        pytest.skip("Movie 1 not in database")
+    
+    def fail(movie_id):
+        raise AssertionError("DB lookup on a matching ETag")
+    monkeypatch.setattr(db, "get_by_id", fail)
+    response = client.get("/movies/1", headers={"If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 304
+
+
+def test_movies_batch_post():
+    response = client.post("/movies", json={"ids": [1, 2, 999999]})
+    assert response.status_code == 200
+    assert 999999 in response.json()["missing"]
+
+
+def test_movies_batch_invalid_ids():
+    response = client.get("/movies?ids=1,abc")
+    assert response.status_code == 400
+
+
+def test_session_follow_up_merges_filters():
+    first = client.post(
+        "/query",
+        json={"question": "Recommend action movies", "session_id": "test-merge"}
+    )
+    assert first.status_code == 200
+    assert first.json()["session_id"] == "test-merge"
+    
+    follow_up = client.post(
+        "/query",
+        json={"question": "What about from 2015?", "session_id": "test-merge"}
+    )
+    assert follow_up.status_code == 200
+    data = follow_up.json()
+    assert data["query_info"]["genre"] == "action"
+    assert data["query_info"]["year"] == 2015
+    assert data["query_info"]["intent"] == "recommend"
+
+
+def test_session_reference_reuses_results():
+    first = client.post(
+        "/query",
+        json={"question": "Recommend action movies", "session_id": "test-ref"}
+    )
+    movies = first.json()["movies"]
+    if len(movies) < 2:
+        pytest.skip("Need at least two results")
+    
+    follow_up = client.post(
+        "/query",
+        json={"question": "Tell me more about the second one", "session_id": "test-ref"}
+    )
+    assert follow_up.status_code == 200
+    data = follow_up.json()
+    assert [m["id"] for m in data["movies"]] == [movies[1]["id"]]
+    assert data["query_info"]["intent"] == "describe"
+
+
+def test_session_title_is_not_a_reference():
+    first = client.post(
+        "/query",
+        json={"question": "Recommend action movies", "session_id": "test-title"}
+    )
+    previous_ids = [m["id"] for m in first.json()["movies"]]
+    
+    response = client.post(
+        "/query",
+        json={"question": "Tell me about The Last Samurai", "session_id": "test-title"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["query_info"]["keywords"] == "last samurai"
+    assert data["query_info"]["intent"] == "describe"
+    assert all(m["id"] not in previous_ids or "Samurai" in m["title"] for m in data["movies"])
+
+
+def test_session_follow_up_with_filler_words():
+    client.post(
+        "/query",
+        json={"question": "Recommend action movies", "session_id": "test-filler"}
+    )
+    response = client.post(
+        "/query",
+        json={"question": "How about something from 2015?", "session_id": "test-filler"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["query_info"]["keywords"] is None
+    assert data["query_info"]["year"] == 2015
+    assert data["query_info"]["genre"] == "action"
+
+
+def test_session_follow_up_after_top_rated():
+    client.post(
+        "/query",
+        json={"question": "What are the best comedy movies?", "session_id": "test-top"}
+    )
+    response = client.post(
+        "/query",
+        json={"question": "What about from 2015?", "session_id": "test-top"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["query_info"]["intent"] != "top_rated"
+    assert data["query_info"]["year"] == 2015
+    assert all(m["year"] == 2015 for m in data["movies"])
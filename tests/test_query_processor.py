@@ -0,0 +1,91 @@
+import pytest
+
+from app.query_processor import parse_query, merge_follow_up, resolve_reference
+
+
+PREVIOUS = {'intent': 'recommend', 'genre': 'action', 'year': None, 'keywords': None}
+
+
+@pytest.mark.parametrize("question", [
+    "How about something from 2016?",
+    "What about ones from 2016?",
+    "What about from 2016?",
+])
+def test_follow_up_year_keeps_previous_filters(question):
+    merged = merge_follow_up(question, PREVIOUS)
+    assert merged == {**PREVIOUS, 'year': 2016}
+
+
+@pytest.mark.parametrize("question", [
+    "Only the ones after 2010",
+    "Only the ones before 2016",
+    "What about since 2012?",
+])
+def test_year_range_is_not_a_follow_up(question):
+    # Search only filters exact years, so merging would flip the meaning
+    assert merge_follow_up(question, {**PREVIOUS, 'year': 2015}) is None
+
+
+def test_follow_up_cleans_previous_keywords():
+    merged = merge_follow_up("What about from 2015?", {**PREVIOUS, 'keywords': 'are ?'})
+    assert merged['keywords'] is None
+    assert merged['year'] == 2015
+
+
+def test_top_rated_is_not_merged():
+    previous = parse_query("What are the best comedy movies?")
+    assert previous['intent'] == 'top_rated'
+    assert merge_follow_up("What about from 2015?", previous) is None
+
+
+def test_follow_up_capitalized_filler_is_a_title():
+    merged = merge_follow_up("What about It?", PREVIOUS)
+    assert merged['keywords'] == 'it'
+    assert merged['genre'] is None
+    
+    assert merge_follow_up("What about it?", PREVIOUS) == PREVIOUS
+
+
+def test_follow_up_replaces_genre():
+    merged = merge_follow_up("Just comedies", PREVIOUS)
+    assert merged['genre'] == 'comedy'
+    assert merged['keywords'] is None
+
+
+def test_follow_up_title_starts_over():
+    merged = merge_follow_up("What about Interstellar?", {**PREVIOUS, 'year': 2015})
+    assert merged['keywords'] == 'interstellar'
+    assert merged['genre'] is None
+    assert merged['year'] is None
+
+
+def test_not_a_follow_up():
+    assert merge_follow_up("Recommend comedy movies", PREVIOUS) is None
+
+
+@pytest.mark.parametrize("question, index", [
+    ("Tell me more about the second one", 1),
+    ("What is the first movie about?", 0),
+    ("And the last one?", -1),
+])
+def test_resolve_reference(question, index):
+    assert resolve_reference(question) == index
+
+
+@pytest.mark.parametrize("question", [
+    "Tell me about The Last Samurai",
+    "Tell me about The First Purge",
+    "Is the last airbender any good?",
+    "What is the last movie from 2015?",
+    "And the first one with comedy?",
+    "Recommend action movies",
+])
+def test_titles_are_not_references(question):
+    assert resolve_reference(question) is None
+
+
+def test_parse_plural_genre():
+    info = parse_query("Recommend comedies from 2010")
+    assert info['genre'] == 'comedy'
+    assert info['year'] == 2010
+    assert info['keywords'] is None
@@ -0,0 +1,58 @@
+import pytest
+
+from app import session_store
+from app.session_store import SessionStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(session_store.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_evicts_least_recently_used(clock):
+    store = SessionStore(max_entries=2, ttl_seconds=60)
+    store.set("a", {"n": 1})
+    store.set("b", {"n": 2})
+    store.set("c", {"n": 3})
+    assert store.get("a") is None
+    assert store.get("b") == {"n": 2}
+    assert len(store) == 2
+
+
+def test_get_refreshes_recency(clock):
+    store = SessionStore(max_entries=2, ttl_seconds=60)
+    store.set("a", {})
+    store.set("b", {})
+    store.get("a")
+    store.set("c", {})
+    assert store.get("a") is not None
+    assert store.get("b") is None
+    assert store.get("c") is not None
+
+
+def test_expires_after_ttl(clock):
+    store = SessionStore(max_entries=10, ttl_seconds=5)
+    store.set("a", {})
+    clock[0] += 6
+    assert store.get("a") is None
+    assert len(store) == 0
+
+
+def test_get_extends_ttl(clock):
+    store = SessionStore(max_entries=10, ttl_seconds=5)
+    store.set("a", {})
+    clock[0] += 4
+    assert store.get("a") is not None
+    clock[0] += 4
+    assert store.get("a") is not None
+
+
+def test_set_purges_expired_sessions(clock):
+    store = SessionStore(max_entries=10, ttl_seconds=5)
+    store.set("a", {})
+    store.set("b", {})
+    clock[0] += 6
+    store.set("c", {})
+    assert len(store) == 1
@@ -0,0 +1,92 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+from app.database import MovieDB
+from app.title_index import TitleIndex, MIN_SIMILARITY
+
+
+MOVIES = [
+    (1, "Inception", 2010),
+    (2, "Interstellar", 2014),
+    (3, "The Dark Knight", 2008),
+    (4, "Insomnia", 2002),
+    (5, "Inception Redux", 2020),
+]
+
+
+def _insert(conn, movie_id, title, year):
+    conn.execute(
+        "INSERT INTO movies VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (movie_id, title, year, json.dumps(["Action"]), "Plot", 7.5, 1000,
+         json.dumps(["Actor"]), "Director")
+    )
+
+
+@pytest.fixture
+def movie_db(tmp_path):
+    path = str(tmp_path / "movies.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE movies (
+            id INTEGER PRIMARY KEY, title TEXT NOT NULL, year INTEGER,
+            genres TEXT, overview TEXT, vote_average REAL, vote_count INTEGER,
+            movie_cast TEXT, director TEXT
+        )
+    """)
+    for movie in MOVIES:
+        _insert(conn, *movie)
+    conn.commit()
+    conn.close()
+    return MovieDB(path)
+
+
+@pytest.fixture
+def index():
+    return TitleIndex((movie_id, title) for movie_id, title, _ in MOVIES)
+
+
+def test_lookup_ranks_closest_title_first(index):
+    results = index.lookup("incepton")
+    assert results[0][0] == 1
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_lookup_applies_min_similarity(index):
+    assert all(score >= MIN_SIMILARITY for _, score in index.lookup("inse"))
+    assert index.lookup("zzzz") == []
+    assert index.lookup("incepton", min_similarity=1.0) == []
+
+
+def test_lookup_empty_and_punctuation_input(index):
+    assert index.lookup("") == []
+    assert index.lookup("?!.,") == []
+
+
+def test_search_falls_back_to_fuzzy_title(movie_db):
+    results = movie_db.search(title="interstelar")
+    assert [m["title"] for m in results] == ["Interstellar"]
+    assert results[0]["genres"] == ["Action"]
+
+
+def test_fuzzy_search_reapplies_filters(movie_db):
+    # "Inception" is the best candidate but the year filter excludes it
+    results = movie_db.search(title="incepton", year=2020)
+    assert [m["title"] for m in results] == ["Inception Redux"]
+
+
+def test_title_index_rebuilds_when_db_changes(movie_db):
+    assert movie_db.title_index.lookup("gladiatr") == []
+    
+    conn = sqlite3.connect(movie_db.db_path)
+    _insert(conn, 6, "Gladiator", 2000)
+    conn.commit()
+    conn.close()
+    # Guarantee a new mtime even on coarse-grained filesystems
+    stat = os.stat(movie_db.db_path)
+    os.utime(movie_db.db_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    
+    assert movie_db.title_index.lookup("gladiatr")[0][0] == 6